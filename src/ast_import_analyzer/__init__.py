@@ -2,7 +2,7 @@
 
 from .analyzer import PythonFileAnalyzer
 from .manager import ImportIssue, LinterManager
-from .visitor import ImportsVisitor
+from .visitor import ImportsVisitor, extract_imports_and_defs
 
 __version__ = "0.1.0"
 __all__ = [
@@ -10,4 +10,5 @@ __all__ = [
     "LinterManager",
     "ImportIssue",
     "ImportsVisitor",
+    "extract_imports_and_defs",
 ]
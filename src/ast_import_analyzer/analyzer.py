@@ -3,7 +3,7 @@
 import ast
 from pathlib import Path
 
-from .visitor import ImportsVisitor
+from .visitor import extract_imports_and_defs
 
 
 class PythonFileAnalyzer:
@@ -13,10 +13,11 @@ class PythonFileAnalyzer:
     Attributes:
         file_path: Path to the Python file to analyze.
         imported_modules: Set of imported module paths after analysis.
-        module_defs: Set of defined symbols after analysis.
+        imported_module_parts: Mapping of each imported path to its dotted components.
+        module_defs: Frozen set of defined symbols after analysis.
     """
 
-    __slots__ = ("file_path", "imported_modules", "module_defs")
+    __slots__ = ("file_path", "imported_modules", "imported_module_parts", "module_defs")
 
     def __init__(self, file_path: Path) -> None:
         """
@@ -27,7 +28,8 @@ class PythonFileAnalyzer:
         """
         self.file_path = file_path
         self.imported_modules: set[str] = set()
-        self.module_defs: set[str] = set()
+        self.imported_module_parts: dict[str, tuple[str, ...]] = {}
+        self.module_defs: frozenset[str] = frozenset()
 
     def analyze(self) -> None:
         """
@@ -37,9 +39,10 @@ class PythonFileAnalyzer:
             FileNotFoundError: If the file does not exist.
             SyntaxError: If the file contains invalid Python syntax.
         """
-        code = self.file_path.read_text(encoding="utf-8")
+        # ast.parse decodes bytes itself, honouring BOMs and PEP 263 coding cookies
+        code = self.file_path.read_bytes()
         tree = ast.parse(code, filename=str(self.file_path))
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
-        self.imported_modules = visitor.imported_modules
-        self.module_defs = visitor.module_defs
+        imported_modules, imported_module_parts, module_defs = extract_imports_and_defs(tree)
+        self.imported_modules = imported_modules
+        self.imported_module_parts = imported_module_parts
+        self.module_defs = frozenset(module_defs)
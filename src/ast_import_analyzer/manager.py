@@ -2,6 +2,10 @@
 
 import logging
 import os
+import sys
+from collections.abc import Iterator
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from fnmatch import fnmatchcase
 from pathlib import Path
 
 from .analyzer import PythonFileAnalyzer
@@ -9,6 +13,62 @@ from .utils import VirtualEnvChecker, pre_cleanup_with_ruff, validate_import
 
 logger = logging.getLogger(__name__)
 
+_ImportParts = dict[str, tuple[str, ...]]
+_ParseResult = tuple[Path, _ImportParts, frozenset[str]] | tuple[Path, None, None]
+
+
+def _parse_one(file_path: Path) -> _ParseResult:
+    """
+    Parse a single Python file and extract its imports and definitions.
+
+    Defined at module level so it can be dispatched to worker processes.
+
+    Args:
+        file_path: Path to the Python file.
+
+    Returns:
+        Tuple of (file_path, imported_module_parts, module_defs), with None in
+        place of both collections if the file could not be analyzed.
+    """
+    try:
+        analyzer = PythonFileAnalyzer(file_path)
+        analyzer.analyze()
+        return file_path, analyzer.imported_module_parts, analyzer.module_defs
+    except SyntaxError as err:
+        logger.warning("Syntax error in %s: %s", file_path, err)
+    except Exception as err:
+        logger.error("Error analyzing %s: %s", file_path, err)
+    return file_path, None, None
+
+
+def _is_glob(name: str) -> bool:
+    """Return whether an excluded directory entry is a glob pattern."""
+    return "*" in name or "?" in name or "[" in name
+
+
+def _gil_enabled() -> bool:
+    """Return whether the interpreter runs with the GIL (always True before 3.13)."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or bool(is_gil_enabled())
+
+
+def _make_executor(workers: int) -> Executor:
+    """
+    Create the executor used for parallel parsing.
+
+    Free-threaded builds parse in threads, avoiding the cost of pickling
+    results back from worker processes.
+
+    Args:
+        workers: Number of CPUs available.
+
+    Returns:
+        A thread pool without the GIL, a process pool otherwise.
+    """
+    if not _gil_enabled():
+        return ThreadPoolExecutor(max_workers=min(32, workers * 4))
+    return ProcessPoolExecutor(max_workers=workers)
+
 
 class ImportIssue:
     """Represents an import validation issue."""
@@ -25,6 +85,24 @@ class ImportIssue:
         return f"[{self.issue_type}] {self.file}: {self.message}"
 
 
+class _ModuleNode:
+    """A node in the trie of project modules, keyed by dotted path component."""
+
+    __slots__ = ("children", "defs", "is_package")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _ModuleNode] = {}
+        self.defs: frozenset[str] | None = None  # Set for module files
+        self.is_package = False  # Set for directories with an __init__.py
+
+    def child(self, name: str) -> "_ModuleNode":
+        """Return the named child, creating it if needed."""
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = _ModuleNode()
+        return node
+
+
 class LinterManager:
     """
     Orchestrates import analysis across a directory tree.
@@ -54,6 +132,9 @@ class LinterManager:
         "migrations",
     }
 
+    # Below this many files, worker startup costs more than parsing serially.
+    PARALLEL_THRESHOLD: int = 32
+
     __slots__ = (
         "root_path",
         "venv_checker",
@@ -61,7 +142,13 @@ class LinterManager:
         "file_imports",
         "issues",
         "excluded_dirs",
+        "_excluded_names",
+        "_excluded_patterns",
         "auto_fix",
+        "jobs",
+        "_module_trie",
+        "_init_files",
+        "_package_probes",
     )
 
     def __init__(
@@ -69,6 +156,7 @@ class LinterManager:
         path: str,
         excluded_dirs: set[str] | None = None,
         auto_fix: bool = False,
+        jobs: int | None = None,
     ) -> None:
         """
         Initialize the linter manager.
@@ -77,16 +165,25 @@ class LinterManager:
             path: Root path to analyze.
             excluded_dirs: Additional directories to exclude from analysis.
             auto_fix: Whether to run ruff auto-fix before analysis.
+            jobs: Number of parallel workers for parsing; defaults to the CPU
+                count. Use 1 to parse serially.
         """
         self.root_path = Path(path).absolute()
         self.venv_checker = VirtualEnvChecker()
-        self.module_defs: dict[Path, set[str]] = {}
-        self.file_imports: dict[Path, set[str]] = {}
+        self.module_defs: dict[Path, frozenset[str]] = {}
+        self.file_imports: dict[Path, _ImportParts] = {}
         self.issues: list[ImportIssue] = []
         self.excluded_dirs = self.DEFAULT_EXCLUDED_DIRS.copy()
         if excluded_dirs:
             self.excluded_dirs.update(excluded_dirs)
+        # Split from excluded_dirs when a walk starts, so later changes to it apply
+        self._excluded_names: frozenset[str] = frozenset()
+        self._excluded_patterns: tuple[str, ...] = ()
         self.auto_fix = auto_fix
+        self.jobs = jobs
+        self._module_trie = _ModuleNode()
+        self._init_files: list[Path] = []
+        self._package_probes: dict[tuple[str, ...], bool] = {}
 
     def run(self) -> list[ImportIssue]:
         """
@@ -101,6 +198,10 @@ class LinterManager:
         if not self.root_path.exists():
             raise FileNotFoundError(f"Path not found: {self.root_path}")
 
+        # One ruff run over the whole tree instead of a process per file
+        if self.auto_fix and self.root_path.is_dir():
+            pre_cleanup_with_ruff(self.root_path, exclude=self.excluded_dirs)
+
         self._collect_files()
         self._validate_imports()
 
@@ -113,6 +214,33 @@ class LinterManager:
         elif self.root_path.is_dir():
             self._analyze_directory()
 
+        self._build_module_trie()
+
+    def _build_module_trie(self) -> None:
+        """Index analyzed files by module path so imports resolve in O(depth)."""
+        root = _ModuleNode()
+
+        # Packages come from the scan, so one still counts if its __init__.py fails to parse
+        for file_path in self._init_files:
+            parts = file_path.relative_to(self.root_path).parts
+            node = root
+            for directory in parts[:-1]:
+                node = node.child(directory)
+            if parts:
+                node.is_package = True
+
+        for file_path, defs in self.module_defs.items():
+            parts = file_path.relative_to(self.root_path).parts
+            if not parts or parts[-1] == "__init__.py":
+                continue
+
+            node = root
+            for directory in parts[:-1]:
+                node = node.child(directory)
+            node.child(parts[-1].removesuffix(".py")).defs = defs
+
+        self._module_trie = root
+
     def _analyze_file(self, file_path: Path) -> None:
         """
         Analyze a single Python file.
@@ -123,51 +251,156 @@ class LinterManager:
         if self.auto_fix:
             pre_cleanup_with_ruff(file_path)
 
+        self._record(_parse_one(file_path))
+
+    def _record(self, result: _ParseResult) -> None:
+        """
+        Store the outcome of parsing a single file.
+
+        Args:
+            result: Tuple returned by `_parse_one`.
+        """
+        file_path, imports, module_defs = result
+        if file_path.name == "__init__.py":
+            self._init_files.append(file_path)
+        if imports is not None and module_defs is not None:
+            self.file_imports[file_path] = imports
+            self.module_defs[file_path] = module_defs
+
+    def _iter_py_files(self, directory: str, check_venv: bool = False) -> Iterator[Path]:
+        """
+        Recursively yield Python files, skipping excluded and virtual environment dirs.
+
+        Uses the type information cached on each `os.DirEntry`, so classifying an
+        entry needs no extra `stat` call, and only builds `Path` objects for results.
+
+        Args:
+            directory: Directory to scan.
+            check_venv: Whether to skip `directory` if it is a virtual environment.
+        """
         try:
-            analyzer = PythonFileAnalyzer(file_path)
-            analyzer.analyze()
-            self.file_imports[file_path] = analyzer.imported_modules
-            self.module_defs[file_path] = analyzer.module_defs
-        except SyntaxError as err:
-            logger.warning("Syntax error in %s: %s", file_path, err)
-        except Exception as err:
-            logger.error("Error analyzing %s: %s", file_path, err)
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError as err:
+            logger.warning("Cannot scan %s: %s", directory, err)
+            return
+
+        # Every layout includes pyvenv.cfg, so only build the name set when it is present
+        if (
+            check_venv
+            and any(entry.name == "pyvenv.cfg" for entry in entries)
+            and self.venv_checker.has_venv_layout({entry.name for entry in entries})
+        ):
+            return
+
+        subdirs: list[str] = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not self._is_excluded(entry.name):
+                    subdirs.append(entry.path)
+            elif entry.name.endswith(".py") and entry.is_file():
+                yield Path(entry.path)
+
+        for subdir in subdirs:
+            yield from self._iter_py_files(subdir, check_venv=True)
+
+    def _is_excluded(self, name: str) -> bool:
+        """
+        Check if a directory name matches an excluded name or pattern.
+
+        Args:
+            name: Directory name to check.
+
+        Returns:
+            True if the directory should be skipped.
+        """
+        if name in self._excluded_names:
+            return True
+        return any(fnmatchcase(name, pattern) for pattern in self._excluded_patterns)
 
     def _analyze_directory(self) -> None:
-        """Walk the directory tree and analyze Python files."""
-        for dirpath, dirnames, filenames in os.walk(self.root_path):
-            # Filter out excluded directories
-            dirnames[:] = [
-                d
-                for d in dirnames
-                if d not in self.excluded_dirs and not self.venv_checker.is_venv(Path(dirpath) / d)
-            ]
-
-            for filename in filenames:
-                if filename.endswith(".py"):
-                    file_path = Path(dirpath) / filename
-                    self._analyze_file(file_path)
+        """Analyze all Python files in the directory tree, in parallel when worthwhile."""
+        # Exact names are matched by set lookup; only glob entries need fnmatch
+        self._excluded_names = frozenset(name for name in self.excluded_dirs if not _is_glob(name))
+        self._excluded_patterns = tuple(name for name in self.excluded_dirs if _is_glob(name))
+
+        paths = list(self._iter_py_files(str(self.root_path)))
+
+        workers = self.jobs or os.cpu_count() or 1
+        if workers > 1 and len(paths) >= self.PARALLEL_THRESHOLD:
+            chunksize = max(1, len(paths) // (4 * workers))
+            try:
+                with _make_executor(workers) as executor:
+                    for result in executor.map(_parse_one, paths, chunksize=chunksize):
+                        self._record(result)
+                return
+            except (BrokenExecutor, OSError) as err:
+                # E.g. spawned workers re-running a script without a __main__ guard
+                logger.warning("Parallel parsing failed, parsing serially: %s", err)
+
+        for file_path in paths:
+            self._record(_parse_one(file_path))
+
+    def _find_module_node(self, parts: tuple[str, ...]) -> _ModuleNode | None:
+        """
+        Walk the module trie along a dotted path.
+
+        Args:
+            parts: Components of the dotted path.
+
+        Returns:
+            The node for the path, or None if no project module or directory matches.
+        """
+        node = self._module_trie
+        for part in parts:
+            next_node = node.children.get(part)
+            if next_node is None:
+                return None
+            node = next_node
+        return node
+
+    def _is_unscanned_package(self, parts: tuple[str, ...]) -> bool:
+        """
+        Check the filesystem for a package under the root that the scan did not index.
+
+        Args:
+            parts: Components of the dotted package path.
+
+        Returns:
+            True if the path is a directory with an `__init__.py`.
+        """
+        probes = self._package_probes
+        found = probes.get(parts)
+        if found is None:
+            init_file = os.path.join(self.root_path, *parts, "__init__.py")
+            found = probes[parts] = os.path.isfile(init_file)
+        return found
 
     def _validate_imports(self) -> None:
         """Validate all collected imports against defined modules."""
+        # Bind once; these are looked up for every import of every file
+        check_import = self._check_import
+        add_issue = self.issues.append
         for file_path, imports in self.file_imports.items():
-            for imp in imports:
-                issue = self._check_import(file_path, imp)
+            for imp, parts in imports.items():
+                issue = check_import(file_path, imp, parts)
                 if issue:
-                    self.issues.append(issue)
+                    add_issue(issue)
 
-    def _check_import(self, file_path: Path, import_path: str) -> ImportIssue | None:
+    def _check_import(
+        self, file_path: Path, import_path: str, parts: tuple[str, ...]
+    ) -> ImportIssue | None:
         """
         Check if an import is valid.
 
         Args:
             file_path: The file containing the import.
             import_path: The dotted import path.
+            parts: The components of `import_path`.
 
         Returns:
             ImportIssue if validation failed, None otherwise.
         """
-        parts = import_path.split(".")
         if not parts:
             return None
 
@@ -175,32 +408,30 @@ class LinterManager:
         module_parts = parts[:-1]
 
         # Try to resolve as a local project import
-        # Check if it's a file in the project
         if module_parts:
-            possible_file = self.root_path / "/".join(module_parts) / f"{attr_name}.py"
-            if possible_file in self.file_imports:
-                # It's importing a module file - valid
-                return None
-
-            possible_file = self.root_path / "/".join(module_parts + [attr_name]) / "__init__.py"
-            if possible_file.exists():
-                # It's importing a package - valid
+            node = self._find_module_node(module_parts)
+            if node is not None:
+                target = node.children.get(attr_name)
+                if target is not None and (target.defs is not None or target.is_package):
+                    # It's importing a module file or a package - valid
+                    return None
+
+                if node.defs is not None:
+                    if attr_name not in node.defs:
+                        return ImportIssue(
+                            file=file_path,
+                            import_path=import_path,
+                            message=f"'{'.'.join(module_parts)}' does not define '{attr_name}'",
+                            issue_type="UNDEFINED",
+                        )
+                    return None
+
+            # A package the scan skipped, e.g. in an excluded directory, is still local
+            if self._is_unscanned_package(parts):
                 return None
 
-            module_file = self.root_path / ("/".join(module_parts) + ".py")
-            if module_file in self.module_defs:
-                defs = self.module_defs[module_file]
-                if attr_name not in defs:
-                    return ImportIssue(
-                        file=file_path,
-                        import_path=import_path,
-                        message=f"'{'.'.join(module_parts)}' does not define '{attr_name}'",
-                        issue_type="UNDEFINED",
-                    )
-                return None
-
-        # Check as external import
-        error = validate_import(import_path, str(file_path))
+        # Check as external import; validate_import caches results by path
+        error = validate_import(import_path)
         if error:
             return ImportIssue(
                 file=file_path,
@@ -247,6 +478,13 @@ def main() -> None:
         default=[],
         help="Additional directories to exclude",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of parallel workers (default: CPU count, 1 disables parallelism)",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -265,6 +503,7 @@ def main() -> None:
         path=args.path,
         excluded_dirs=set(args.exclude) if args.exclude else None,
         auto_fix=args.fix,
+        jobs=args.jobs,
     )
 
     try:
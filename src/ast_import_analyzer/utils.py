@@ -1,10 +1,16 @@
 """Utility functions for import analysis."""
 
+import functools
 import logging
+import os
 import subprocess
 import sys
+from collections.abc import Iterable
+from collections.abc import Set as AbstractSet
 from importlib import import_module
+from importlib.metadata import distributions
 from pathlib import Path
+from types import ModuleType
 
 logger = logging.getLogger(__name__)
 
@@ -29,24 +35,52 @@ def run_subprocess(command: list[str]) -> subprocess.CompletedProcess | None:
         return None
 
 
-def pre_cleanup_with_ruff(path: Path) -> bool:
+def pre_cleanup_with_ruff(path: Path, exclude: Iterable[str] = ()) -> bool:
     """
-    Run ruff linter with auto-fix on a file.
+    Run ruff linter with auto-fix on a file or directory tree.
 
     Args:
-        path: Path to the file to lint.
+        path: Path to the file or directory to lint.
+        exclude: Additional file or directory patterns for ruff to skip.
 
     Returns:
         True if ruff ran successfully, False otherwise.
     """
-    result = run_subprocess(["ruff", "check", str(path), "--fix"])
+    command = ["ruff", "check", str(path), "--fix"]
+    patterns = sorted(exclude)
+    if patterns:
+        command.append(f"--extend-exclude={','.join(patterns)}")
+    result = run_subprocess(command)
     return result is not None and result.returncode == 0
 
 
+@functools.lru_cache(maxsize=1)
 def get_installed_packages() -> set[str]:
     """
     Get the set of currently installed packages.
 
+    Reads distribution metadata in-process, falling back to `pip freeze` if
+    that fails. The result is cached, so callers must not modify it.
+
+    Returns:
+        Set of package names (lowercase, without versions).
+    """
+    try:
+        # Broken installs can leave a dist-info directory without a name
+        return {
+            metadata["Name"].lower()
+            for metadata in (dist.metadata for dist in distributions())
+            if "Name" in metadata
+        }
+    except Exception as err:
+        logger.warning("Reading package metadata failed, falling back to pip: %s", err)
+        return _get_installed_packages_from_pip()
+
+
+def _get_installed_packages_from_pip() -> set[str]:
+    """
+    Get the set of installed packages by running `pip freeze`.
+
     Returns:
         Set of package names (lowercase, without versions).
     """
@@ -68,6 +102,10 @@ def get_installed_packages() -> set[str]:
     return packages
 
 
+# Stands in for the source file context in cached messages from _validate_core
+_SOURCE_FILE = "{source_file}"
+
+
 def validate_import(dotted_path: str, source_file: str | None = None) -> str | None:
     """
     Validate that a dotted import path resolves to an actual module/attribute.
@@ -79,6 +117,27 @@ def validate_import(dotted_path: str, source_file: str | None = None) -> str | N
     Returns:
         Error message if validation failed, None if successful.
     """
+    error = _validate_core(dotted_path)
+    if error is None or _SOURCE_FILE not in error:
+        return error
+    return error.replace(_SOURCE_FILE, f" in {source_file}" if source_file else "")
+
+
+@functools.lru_cache(maxsize=8192)
+def _validate_core(dotted_path: str) -> str | None:
+    """
+    Validate a dotted import path independently of the file importing it.
+
+    The same path is typically imported by many files, so results are cached
+    and the source file is filled in by `validate_import`.
+
+    Args:
+        dotted_path: The import path to validate.
+
+    Returns:
+        Error message with a `_SOURCE_FILE` placeholder where the source file
+        context goes, or None if successful.
+    """
     if not dotted_path:
         return "Empty import path"
 
@@ -88,20 +147,46 @@ def validate_import(dotted_path: str, source_file: str | None = None) -> str | N
         module_path = dotted_path
         attr_name = ""
 
+    module = _resolve_module(module_path)
+    if isinstance(module, ModuleNotFoundError):
+        return f"Module not found: '{module_path}'{_SOURCE_FILE} ({module})"
+    if isinstance(module, Exception):
+        return f"Import error for '{dotted_path}': {module}"
+
     try:
-        module = import_module(module_path)
         if attr_name and not hasattr(module, attr_name):
-            ctx = f" in {source_file}" if source_file else ""
-            return f"Module '{module_path}' has no attribute '{attr_name}'{ctx}"
-    except ModuleNotFoundError as err:
-        ctx = f" in {source_file}" if source_file else ""
-        return f"Module not found: '{module_path}'{ctx} ({err})"
+            return f"Module '{module_path}' has no attribute '{attr_name}'{_SOURCE_FILE}"
     except Exception as err:
         return f"Import error for '{dotted_path}': {err}"
 
     return None
 
 
+@functools.lru_cache(maxsize=4096)
+def _resolve_module(module_path: str) -> ModuleType | Exception:
+    """
+    Import a module by dotted path, caching the outcome.
+
+    Failures are cached too, so a missing module is only searched for once.
+
+    Args:
+        module_path: The dotted module path to import.
+
+    Returns:
+        The module, or the exception raised while importing it.
+    """
+    # Already-imported modules skip the import machinery entirely
+    module = sys.modules.get(module_path)
+    if module is not None:
+        return module
+
+    try:
+        return import_module(module_path)
+    except Exception as err:
+        # Drop the traceback so the cache doesn't keep the import frames alive
+        return err.with_traceback(None)
+
+
 class VirtualEnvChecker:
     """Utility to detect virtual environment directories."""
 
@@ -112,6 +197,12 @@ class VirtualEnvChecker:
         "win32": {"Scripts", "Include", "Lib", "pyvenv.cfg"},
     }
 
+    __slots__ = ("_indicators",)
+
+    def __init__(self) -> None:
+        # pyvenv.cfg is always present, so it is the fallback on other platforms
+        self._indicators = frozenset(self.VENV_INDICATORS.get(sys.platform, {"pyvenv.cfg"}))
+
     def is_venv(self, path: Path) -> bool:
         """
         Check if a path is likely a virtual environment.
@@ -122,12 +213,24 @@ class VirtualEnvChecker:
         Returns:
             True if the path appears to be a virtual environment.
         """
-        if not path.is_dir():
+        try:
+            with os.scandir(path) as it:
+                names = {entry.name for entry in it}
+        except OSError:
             return False
 
-        indicators = self.VENV_INDICATORS.get(sys.platform, set())
-        if not indicators:
-            # Fallback: check for pyvenv.cfg which is always present
-            return (path / "pyvenv.cfg").exists()
+        return self.has_venv_layout(names)
+
+    def has_venv_layout(self, names: AbstractSet[str]) -> bool:
+        """
+        Check if a directory listing looks like a virtual environment.
+
+        Lets callers that already scanned a directory reuse the listing.
+
+        Args:
+            names: Names of the entries in the directory.
 
-        return all((path / ind).exists() for ind in indicators)
+        Returns:
+            True if all virtual environment indicators are present.
+        """
+        return self._indicators <= names
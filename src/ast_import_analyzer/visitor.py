@@ -1,22 +1,120 @@
 """AST visitor for extracting imports and module definitions."""
 
 import ast
+import sys
+from collections.abc import Callable
+from typing import Any, ClassVar
 
+# Bound once; stdlib AST node classes are never subclassed, so exact type checks suffice
+_NAME = ast.Name
+_TUPLE = ast.Tuple
+_LIST = ast.List
+_STARRED = ast.Starred
 
-class ImportsVisitor(ast.NodeVisitor):
+# Fields that hold lists of statements (or of except handlers and match cases)
+_BLOCK_FIELDS = frozenset({"body", "orelse", "finalbody", "handlers", "cases"})
+
+# Per node type, which of its fields are in _BLOCK_FIELDS; filled in on first use
+_BLOCK_FIELDS_BY_TYPE: dict[type[ast.AST], tuple[str, ...]] = {}
+
+# The only node types the walk reaches: roots, statements and the nodes holding blocks
+_REACHABLE_TYPES = (ast.mod, ast.stmt, ast.excepthandler, ast.match_case)
+
+
+class ImportsVisitor:
     """
     AST visitor to extract imported modules and defined symbols from Python code.
 
+    Walks the tree in a single loop and dispatches on each node's exact type
+    through a lookup table, instead of `ast.NodeVisitor`'s per-node method lookup.
+    The `ast.NodeVisitor` hooks (`visit_Import`, ..., `generic_visit`) are kept
+    and can be called directly. Subclasses may override `visit_*` hooks for
+    statements (and module, except handler and match case nodes); the walk never
+    reaches expressions or calls `generic_visit` itself, so overriding an
+    expression hook such as `visit_Name`, or `generic_visit`, raises `TypeError`.
+
     Attributes:
         imported_modules: Set of imported module paths (dotted notation).
+        imported_module_parts: Mapping of each imported path to its dotted components.
         module_defs: Set of locally defined classes, functions, and variables.
+        module_level_only: Whether to skip the bodies of functions and methods.
     """
 
-    __slots__ = ("imported_modules", "module_defs")
+    __slots__ = ("imported_modules", "imported_module_parts", "module_defs", "module_level_only")
+
+    def __init__(self, module_level_only: bool = True) -> None:
+        """
+        Initialize the visitor.
 
-    def __init__(self) -> None:
+        Args:
+            module_level_only: Skip function bodies, whose imports and local
+                variables are not part of the module's namespace.
+        """
         self.imported_modules: set[str] = set()
+        self.imported_module_parts: dict[str, tuple[str, ...]] = {}
         self.module_defs: set[str] = set()
+        self.module_level_only = module_level_only
+
+    def visit(self, node: ast.AST) -> None:
+        """
+        Collect imports and definitions from a tree, adding to any already collected.
+
+        Args:
+            node: The root node to visit.
+        """
+        dispatch = self._DISPATCH
+        block_fields = _BLOCK_FIELDS_BY_TYPE
+        stack: list[Any] = [node]
+        while stack:
+            current = stack.pop()
+            node_type = type(current)
+            handler = dispatch.get(node_type)
+            if handler is not None and not handler(self, current):
+                continue
+
+            # Imports and definitions are statements, so only statement blocks are
+            # descended into; expression subtrees (most of any tree) are never walked.
+            fields = block_fields.get(node_type)
+            if fields is None:
+                fields = block_fields[node_type] = tuple(
+                    field for field in node_type._fields if field in _BLOCK_FIELDS
+                )
+            for field in fields:
+                block = getattr(current, field)
+                if type(block) is list:  # Lambda.body and IfExp.body are single expressions
+                    stack.extend(block)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        """
+        Visit every direct child of a node, as `ast.NodeVisitor.generic_visit` does.
+
+        Args:
+            node: The node whose children to visit.
+        """
+        for child in ast.iter_child_nodes(node):
+            self.visit(child)
+
+    def reset(self) -> None:
+        """Clear collected imports and definitions so the visitor can be reused."""
+        self.imported_modules.clear()
+        self.imported_module_parts.clear()
+        self.module_defs.clear()
+
+    def _add_import(self, path: str, parts: tuple[str, ...]) -> None:
+        """
+        Record an imported path along with its components.
+
+        Paths are interned so the same path seen in many files is stored once.
+
+        Args:
+            path: The dotted import path.
+            parts: The components of `path`.
+        """
+        path = sys.intern(path)
+        self.imported_module_parts[path] = parts
+        self.imported_modules.add(path)
+
+    # ast.NodeVisitor-style hooks; the walk itself calls the handlers below.
 
     def visit_Import(self, node: ast.Import) -> None:
         """
@@ -25,33 +123,16 @@ class ImportsVisitor(ast.NodeVisitor):
         Args:
             node: The Import node to visit.
         """
-        for alias in node.names:
-            self.imported_modules.add(alias.name)
-        self.generic_visit(node)
+        self._visit_import(node)
 
     def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
         """
         Visit an ImportFrom node (e.g., `from os import path`).
 
-        Handles both absolute and relative imports.
-
         Args:
             node: The ImportFrom node to visit.
         """
-        module = node.module or ""  # Handle relative imports where module is None
-
-        for alias in node.names:
-            if alias.name == "*":
-                # Star import - just track the module
-                if module:
-                    self.imported_modules.add(module)
-            elif module:
-                self.imported_modules.add(f"{module}.{alias.name}")
-            else:
-                # Relative import with no module (from . import foo)
-                self.imported_modules.add(alias.name)
-
-        self.generic_visit(node)
+        self._visit_import_from(node)
 
     def visit_Assign(self, node: ast.Assign) -> None:
         """
@@ -60,43 +141,208 @@ class ImportsVisitor(ast.NodeVisitor):
         Args:
             node: The Assign node to visit.
         """
-        for target in node.targets:
-            if isinstance(target, ast.Name):
-                self.module_defs.add(target.id)
-            elif isinstance(target, ast.Tuple):
-                # Handle tuple unpacking: a, b = 1, 2
-                for elt in target.elts:
-                    if isinstance(elt, ast.Name):
-                        self.module_defs.add(elt.id)
-
-        self.generic_visit(node)
+        self._visit_assign(node)
 
     def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
         """
-        Visit a FunctionDef node.
+        Visit a FunctionDef node, and its body unless `module_level_only` is set.
 
         Args:
             node: The FunctionDef node to visit.
         """
-        self.module_defs.add(node.name)
-        self.generic_visit(node)
+        if self._visit_function_def(node):
+            self.generic_visit(node)
 
     def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
         """
-        Visit an AsyncFunctionDef node.
+        Visit an AsyncFunctionDef node, and its body unless `module_level_only` is set.
 
         Args:
             node: The AsyncFunctionDef node to visit.
         """
-        self.module_defs.add(node.name)
-        self.generic_visit(node)
+        if self._visit_function_def(node):
+            self.generic_visit(node)
 
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
         """
-        Visit a ClassDef node.
+        Visit a ClassDef node and its body.
 
         Args:
             node: The ClassDef node to visit.
         """
+        if self._visit_class_def(node):
+            self.generic_visit(node)
+
+    # Handlers return whether the node's children should be visited.
+
+    def _visit_import(self, node: ast.Import) -> bool:
+        """
+        Handle an Import node (e.g., `import os`).
+
+        Args:
+            node: The Import node to handle.
+
+        Returns:
+            False; aliases have no children of interest.
+        """
+        for alias in node.names:
+            self._add_import(alias.name, tuple(alias.name.split(".")))
+        return False
+
+    def _visit_import_from(self, node: ast.ImportFrom) -> bool:
+        """
+        Handle an ImportFrom node (e.g., `from os import path`).
+
+        Handles both absolute and relative imports.
+
+        Args:
+            node: The ImportFrom node to handle.
+
+        Returns:
+            False; aliases have no children of interest.
+        """
+        module = node.module or ""  # Handle relative imports where module is None
+        module_parts = tuple(module.split(".")) if module else ()
+
+        for alias in node.names:
+            if alias.name == "*":
+                # Star import - just track the module
+                if module:
+                    self._add_import(module, module_parts)
+            elif module:
+                self._add_import(f"{module}.{alias.name}", (*module_parts, alias.name))
+            else:
+                # Relative import with no module (from . import foo)
+                self._add_import(alias.name, (alias.name,))
+        return False
+
+    def _visit_function_def(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
+        """
+        Handle a FunctionDef or AsyncFunctionDef node.
+
+        Args:
+            node: The function definition node to handle.
+
+        Returns:
+            Whether to visit the function body, i.e. not `module_level_only`.
+        """
+        self.module_defs.add(node.name)
+        return not self.module_level_only
+
+    def _visit_class_def(self, node: ast.ClassDef) -> bool:
+        """
+        Handle a ClassDef node.
+
+        Args:
+            node: The ClassDef node to handle.
+
+        Returns:
+            True; the body is visited to find methods and nested classes.
+        """
         self.module_defs.add(node.name)
-        self.generic_visit(node)
+        return True
+
+    def _visit_assign(self, node: ast.Assign) -> bool:
+        """
+        Handle an Assign node to track variable definitions.
+
+        Unpacks targets directly, including nested and starred ones
+        (`(a, b), *rest = ...`).
+
+        Args:
+            node: The Assign node to handle.
+
+        Returns:
+            False; the remaining children are expressions, which cannot
+            define anything.
+        """
+        add = self.module_defs.add
+        targets: list[Any] = list(node.targets)
+        while targets:
+            target = targets.pop()
+            target_type = type(target)
+            if target_type is _NAME:
+                add(target.id)
+            elif target_type is _TUPLE or target_type is _LIST:
+                targets.extend(target.elts)
+            elif target_type is _STARRED:
+                targets.append(target.value)
+        return False
+
+    # Maps node types to handlers
+    _DISPATCH: ClassVar[dict[type[ast.AST], Callable[[Any, Any], bool]]] = {
+        ast.Import: _visit_import,
+        ast.ImportFrom: _visit_import_from,
+        ast.FunctionDef: _visit_function_def,
+        ast.AsyncFunctionDef: _visit_function_def,
+        ast.ClassDef: _visit_class_def,
+        ast.Assign: _visit_assign,
+    }
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """
+        Route node types whose `visit_*` hook a subclass overrides to that hook.
+
+        Raises:
+            TypeError: If the subclass overrides `generic_visit` or a hook for a
+                node type the walk never reaches.
+        """
+        super().__init_subclass__(**kwargs)
+        if cls.generic_visit is not ImportsVisitor.generic_visit:
+            raise TypeError(f"{cls.__name__} overrides generic_visit, which the walk never calls")
+
+        dispatch = dict(cls._DISPATCH)
+        for name in dir(cls):
+            node_type = getattr(ast, name[6:], None) if name.startswith("visit_") else None
+            if not isinstance(node_type, type) or getattr(cls, name) is getattr(
+                ImportsVisitor, name, None
+            ):
+                continue
+            if not issubclass(node_type, _REACHABLE_TYPES):
+                raise TypeError(
+                    f"{cls.__name__}.{name} is never called: the walk only visits "
+                    f"statements, not {node_type.__name__} nodes"
+                )
+            dispatch[node_type] = _hook_handler(name)
+        cls._DISPATCH = dispatch
+
+
+def _hook_handler(name: str) -> Callable[[Any, Any], bool]:
+    """
+    Wrap an `ast.NodeVisitor`-style hook as a dispatch handler.
+
+    Such hooks descend by calling `generic_visit` themselves, so the walk
+    never descends after them.
+
+    Args:
+        name: Name of the hook method, e.g. "visit_Import".
+
+    Returns:
+        A handler calling the hook on the visitor.
+    """
+
+    def handler(visitor: Any, node: Any) -> bool:
+        getattr(visitor, name)(node)
+        return False
+
+    return handler
+
+
+def extract_imports_and_defs(
+    tree: ast.AST, module_level_only: bool = True
+) -> tuple[set[str], dict[str, tuple[str, ...]], set[str]]:
+    """
+    Extract imported module paths and defined symbols from a syntax tree.
+
+    Args:
+        tree: The syntax tree to scan.
+        module_level_only: Skip function bodies, whose imports and local
+            variables are not part of the module's namespace.
+
+    Returns:
+        Tuple of (imported_modules, imported_module_parts, module_defs), where
+        imported_module_parts maps each imported path to its dotted components.
+    """
+    visitor = ImportsVisitor(module_level_only)
+    visitor.visit(tree)
+    return visitor.imported_modules, visitor.imported_module_parts, visitor.module_defs
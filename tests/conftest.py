@@ -0,0 +1,29 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+from ast_import_analyzer.utils import _resolve_module, _validate_core
+from ast_import_analyzer.visitor import ImportsVisitor
+
+
+@pytest.fixture(autouse=True)
+def clear_import_caches():
+    """Give each test fresh import validation caches so results don't leak between tests."""
+    _validate_core.cache_clear()
+    _resolve_module.cache_clear()
+    yield
+    _validate_core.cache_clear()
+    _resolve_module.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def visitor_pool():
+    """A single visitor shared by the tests in a module."""
+    return ImportsVisitor()
+
+
+@pytest.fixture
+def visitor(visitor_pool):
+    """Lend the pooled visitor to a test and reset it afterwards."""
+    yield visitor_pool
+    visitor_pool.reset()
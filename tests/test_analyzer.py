@@ -42,8 +42,7 @@ SERVICE_INSTANCE = None
         analyzer.analyze()
 
         assert "typing.Optional" in analyzer.imported_modules
-        assert "MyService" in analyzer.module_defs
-        assert "SERVICE_INSTANCE" in analyzer.module_defs
+        assert analyzer.module_defs >= {"MyService", "SERVICE_INSTANCE"}
 
     def test_analyze_file_not_found(self, tmp_path: Path):
         """Test that FileNotFoundError is raised for missing files."""
@@ -92,15 +91,17 @@ from ..parent import util
         analyzer = PythonFileAnalyzer(file_path)
         analyzer.analyze()
 
-        assert "os" in analyzer.imported_modules
-        assert "sys" in analyzer.imported_modules
-        assert "pathlib.Path" in analyzer.imported_modules
-        assert "typing.Optional" in analyzer.imported_modules
-        assert "typing.List" in analyzer.imported_modules
-        assert "typing.Dict" in analyzer.imported_modules
-        assert "collections.abc.Iterator" in analyzer.imported_modules
-        assert "local.helper" in analyzer.imported_modules
-        assert "parent.util" in analyzer.imported_modules
+        assert analyzer.imported_modules >= {
+            "os",
+            "sys",
+            "pathlib.Path",
+            "typing.Optional",
+            "typing.List",
+            "typing.Dict",
+            "collections.abc.Iterator",
+            "local.helper",
+            "parent.util",
+        }
 
     def test_analyze_utf8_file(self, tmp_path: Path):
         """Test analyzing a file with UTF-8 content."""
@@ -112,6 +113,16 @@ from ..parent import util
 
         assert "привет" in analyzer.module_defs
 
+    def test_analyze_declared_encoding(self, tmp_path: Path):
+        """Test that a PEP 263 coding declaration is honoured."""
+        file_path = tmp_path / "latin1.py"
+        file_path.write_bytes("# -*- coding: latin-1 -*-\ncafé = 1\n".encode("latin-1"))
+
+        analyzer = PythonFileAnalyzer(file_path)
+        analyzer.analyze()
+
+        assert "café" in analyzer.module_defs
+
     def test_file_path_stored(self, tmp_path: Path):
         """Test that file_path is correctly stored."""
         file_path = tmp_path / "test.py"
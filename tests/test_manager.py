@@ -1,9 +1,12 @@
 """Tests for the LinterManager class."""
 
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from ast_import_analyzer import manager as manager_module
 from ast_import_analyzer.manager import ImportIssue, LinterManager
 
 
@@ -33,10 +36,7 @@ class TestLinterManager:
         """Test that default excluded directories are set."""
         manager = LinterManager(str(tmp_path))
 
-        assert "__pycache__" in manager.excluded_dirs
-        assert ".git" in manager.excluded_dirs
-        assert "venv" in manager.excluded_dirs
-        assert ".venv" in manager.excluded_dirs
+        assert manager.excluded_dirs >= {"__pycache__", ".git", "venv", ".venv"}
 
     def test_init_custom_excluded_dirs(self, tmp_path: Path):
         """Test adding custom excluded directories."""
@@ -45,10 +45,8 @@ class TestLinterManager:
             excluded_dirs={"custom_dir", "another_dir"},
         )
 
-        assert "custom_dir" in manager.excluded_dirs
-        assert "another_dir" in manager.excluded_dirs
         # Default dirs should still be present
-        assert "__pycache__" in manager.excluded_dirs
+        assert manager.excluded_dirs >= {"custom_dir", "another_dir", "__pycache__"}
 
     def test_run_nonexistent_path(self, tmp_path: Path):
         """Test that FileNotFoundError is raised for missing paths."""
@@ -113,6 +111,35 @@ class TestLinterManager:
 
         assert len(manager.file_imports) == 1
 
+    def test_excludes_glob_patterns(self, tmp_path: Path):
+        """Test that glob entries such as *.egg-info exclude matching directories."""
+        egg_info = tmp_path / "mypkg.egg-info"
+        egg_info.mkdir()
+        (egg_info / "stray.py").write_text("import os\n")
+        generated = tmp_path / "generated_v2"
+        generated.mkdir()
+        (generated / "models.py").write_text("import os\n")
+        (tmp_path / "main.py").write_text("import sys\n")
+
+        manager = LinterManager(str(tmp_path), excluded_dirs={"generated_*"})
+        manager.run()
+
+        assert list(manager.file_imports) == [tmp_path / "main.py"]
+
+    def test_excludes_detected_venv(self, tmp_path: Path):
+        """Test that virtual environments with non-standard names are excluded."""
+        venv = tmp_path / "my_env"
+        for name in ("bin", "include", "lib"):
+            (venv / name).mkdir(parents=True)
+        (venv / "pyvenv.cfg").write_text("home = /usr/bin\n")
+        (venv / "lib" / "site.py").write_text("import os\n")
+        (tmp_path / "main.py").write_text("import sys\n")
+
+        manager = LinterManager(str(tmp_path))
+        manager.run()
+
+        assert list(manager.file_imports) == [tmp_path / "main.py"]
+
     def test_analyze_file_with_syntax_error(self, tmp_path: Path):
         """Test that files with syntax errors are skipped gracefully."""
         (tmp_path / "valid.py").write_text("import os\n")
@@ -137,6 +164,146 @@ class TestLinterManager:
 
         assert len(manager.file_imports) == 3  # main.py, __init__.py, module.py
 
+    @pytest.mark.parametrize("gil_enabled", [True, False], ids=["processes", "threads"])
+    def test_parallel_analysis(self, tmp_path: Path, monkeypatch, gil_enabled: bool):
+        """Test that the parallel paths collect the same results."""
+        monkeypatch.setattr(LinterManager, "PARALLEL_THRESHOLD", 1)
+        monkeypatch.setattr(manager_module, "_gil_enabled", lambda: gil_enabled)
+        monkeypatch.setattr(manager_module.os, "cpu_count", lambda: 4)
+        for i in range(4):
+            (tmp_path / f"mod{i}.py").write_text(f"import os\n\nVALUE_{i} = {i}\n")
+        (tmp_path / "invalid.py").write_text("def broken(\n")
+
+        manager = LinterManager(str(tmp_path))
+        manager.run()
+
+        assert len(manager.file_imports) == 4
+        assert "os" in manager.file_imports[tmp_path / "mod0.py"]
+        assert "VALUE_3" in manager.module_defs[tmp_path / "mod3.py"]
+
+    def test_jobs_one_parses_serially(self, tmp_path: Path, monkeypatch):
+        """Test that jobs=1 never creates an executor."""
+        monkeypatch.setattr(LinterManager, "PARALLEL_THRESHOLD", 1)
+        monkeypatch.setattr(manager_module.os, "cpu_count", lambda: 4)
+        (tmp_path / "mod.py").write_text("import os\n")
+
+        with patch.object(manager_module, "_make_executor") as mock_make_executor:
+            manager = LinterManager(str(tmp_path), jobs=1)
+            manager.run()
+
+        mock_make_executor.assert_not_called()
+        assert "os" in manager.file_imports[tmp_path / "mod.py"]
+
+    def test_broken_pool_falls_back_to_serial(self, tmp_path: Path, monkeypatch):
+        """Test that a pool whose workers die is replaced by serial parsing."""
+        monkeypatch.setattr(LinterManager, "PARALLEL_THRESHOLD", 1)
+        monkeypatch.setattr(manager_module.os, "cpu_count", lambda: 4)
+        for i in range(4):
+            (tmp_path / f"mod{i}.py").write_text(f"VALUE_{i} = {i}\n")
+
+        with patch.object(manager_module, "_make_executor") as mock_make_executor:
+            executor = mock_make_executor.return_value.__enter__.return_value
+            executor.map.side_effect = BrokenProcessPool("worker died")
+            manager = LinterManager(str(tmp_path))
+            manager.run()
+
+        assert len(manager.module_defs) == 4
+        assert "VALUE_3" in manager.module_defs[tmp_path / "mod3.py"]
+
+    def test_local_package_import(self, tmp_path: Path):
+        """Test that importing a project subpackage is resolved locally."""
+        subpackage = tmp_path / "pkg" / "sub"
+        subpackage.mkdir(parents=True)
+        (tmp_path / "pkg" / "__init__.py").write_text("")
+        (subpackage / "__init__.py").write_text("")
+        (tmp_path / "main.py").write_text("from pkg import sub\n")
+
+        manager = LinterManager(str(tmp_path))
+        issues = manager.run()
+
+        assert issues == []
+
+    def test_package_with_invalid_init_is_local(self, tmp_path: Path):
+        """Test that a package counts as local even if its __init__.py fails to parse."""
+        subpackage = tmp_path / "pkg" / "sub"
+        subpackage.mkdir(parents=True)
+        (tmp_path / "pkg" / "__init__.py").write_text("")
+        (subpackage / "__init__.py").write_text("def broken(\n")
+        (tmp_path / "main.py").write_text("from pkg import sub\n")
+
+        manager = LinterManager(str(tmp_path))
+        issues = manager.run()
+
+        assert issues == []
+
+    def test_excluded_dirs_added_after_construction(self, tmp_path: Path):
+        """Test that directories added to excluded_dirs after construction are skipped."""
+        (tmp_path / "gen").mkdir()
+        (tmp_path / "gen" / "a.py").write_text("import os\n")
+        (tmp_path / "main.py").write_text("import os\n")
+
+        manager = LinterManager(str(tmp_path))
+        manager.excluded_dirs.add("gen")
+        manager.run()
+
+        assert set(manager.file_imports) == {tmp_path / "main.py"}
+
+    def test_package_in_excluded_dir_is_local(self, tmp_path: Path):
+        """Test that a package inside an excluded directory is not reported as external."""
+        package = tmp_path / "migrations" / "app"
+        package.mkdir(parents=True)
+        (tmp_path / "migrations" / "__init__.py").write_text("")
+        (package / "__init__.py").write_text("")
+        (tmp_path / "main.py").write_text("from migrations import app\n")
+
+        manager = LinterManager(str(tmp_path))
+        issues = manager.run()
+
+        assert issues == []
+
+    def test_undefined_local_import(self, tmp_path: Path):
+        """Test that importing a name a project module doesn't define is reported."""
+        package = tmp_path / "pkg"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "mod.py").write_text("def foo():\n    pass\n")
+        (tmp_path / "main.py").write_text(
+            "from pkg import mod\nfrom pkg.mod import foo\nfrom pkg.mod import bar\n"
+        )
+
+        manager = LinterManager(str(tmp_path))
+        issues = manager.run()
+
+        assert len(issues) == 1
+        assert issues[0].issue_type == "UNDEFINED"
+        assert issues[0].import_path == "pkg.mod.bar"
+        assert issues[0].file == tmp_path / "main.py"
+
+    def test_function_level_imports_not_validated(self, tmp_path: Path):
+        """Test that lazy imports inside function bodies are not reported."""
+        (tmp_path / "main.py").write_text(
+            "def load():\n    import nonexistent_module_xyz\n    return nonexistent_module_xyz\n"
+        )
+
+        manager = LinterManager(str(tmp_path))
+        issues = manager.run()
+
+        assert issues == []
+        assert "load" in manager.module_defs[tmp_path / "main.py"]
+
+    def test_external_validation_is_cached(self, tmp_path: Path):
+        """Test that an external import shared by several files is only looked up once."""
+        (tmp_path / "a.py").write_text("import cached_external_xyz\n")
+        (tmp_path / "b.py").write_text("import cached_external_xyz\n")
+
+        manager = LinterManager(str(tmp_path))
+        with patch("ast_import_analyzer.utils.import_module") as mock_import:
+            mock_import.side_effect = ModuleNotFoundError("No module named 'cached_external_xyz'")
+            issues = manager.run()
+
+        mock_import.assert_called_once_with("cached_external_xyz")
+        assert {issue.file for issue in issues} == {tmp_path / "a.py", tmp_path / "b.py"}
+
     def test_print_report_no_issues(self, tmp_path: Path, capsys):
         """Test print_report with no issues."""
         (tmp_path / "clean.py").write_text("import os\n")
@@ -159,7 +326,7 @@ class TestLinterManager:
                 issue_type="EXTERNAL",
             )
         ]
-        manager.file_imports = {Path("/test.py"): set()}
+        manager.file_imports = {Path("/test.py"): {}}
         manager.print_report()
 
         captured = capsys.readouterr()
@@ -175,3 +342,15 @@ class TestLinterManager:
         """Test that auto_fix can be enabled."""
         manager = LinterManager(str(tmp_path), auto_fix=True)
         assert manager.auto_fix is True
+
+    def test_auto_fix_runs_ruff_once_for_directory(self, tmp_path: Path):
+        """Test that auto_fix lints a directory with a single ruff run."""
+        (tmp_path / "file1.py").write_text("import os\n")
+        (tmp_path / "file2.py").write_text("import sys\n")
+
+        manager = LinterManager(str(tmp_path), auto_fix=True)
+        with patch("ast_import_analyzer.manager.pre_cleanup_with_ruff") as mock_ruff:
+            manager.run()
+
+        mock_ruff.assert_called_once_with(tmp_path, exclude=manager.excluded_dirs)
+        assert len(manager.file_imports) == 2
@@ -1,7 +1,9 @@
 """Tests for utility functions."""
 
+import os
+import sys
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -32,7 +34,8 @@ class TestRunSubprocess:
 
     def test_command_with_error(self):
         """Test command that exits with error."""
-        result = run_subprocess(["python", "-c", "import sys; sys.exit(1)"])
+        # -S -I skip site initialization, the bulk of interpreter startup
+        result = run_subprocess([sys.executable, "-S", "-I", "-c", "raise SystemExit(1)"])
 
         assert result is not None
         assert result.returncode == 1
@@ -79,6 +82,18 @@ class TestValidateImport:
 
         assert result == "Empty import path"
 
+    @patch("ast_import_analyzer.utils.import_module")
+    def test_failed_lookup_is_cached(self, mock_import):
+        """Test that a missing module is only searched for once."""
+        mock_import.side_effect = ModuleNotFoundError("No module named 'cached_missing_xyz'")
+
+        first = validate_import("cached_missing_xyz.attr")
+        second = validate_import("cached_missing_xyz.other")
+
+        mock_import.assert_called_once_with("cached_missing_xyz")
+        assert first is not None and "Module not found" in first
+        assert second is not None and "Module not found" in second
+
     def test_source_file_context(self):
         """Test that source file is included in error context."""
         result = validate_import("nonexistent_module", source_file="test.py")
@@ -86,10 +101,27 @@ class TestValidateImport:
         assert result is not None
         assert "test.py" in result
 
+    def test_cached_result_reports_each_source_file(self):
+        """Test that a cached failure is reported with the file that imported it."""
+        first = validate_import("os.missing_attr_xyz", source_file="a.py")
+        second = validate_import("os.missing_attr_xyz", source_file="b.py")
+        bare = validate_import("os.missing_attr_xyz")
+
+        assert first == "Module 'os' has no attribute 'missing_attr_xyz' in a.py"
+        assert second == "Module 'os' has no attribute 'missing_attr_xyz' in b.py"
+        assert bare == "Module 'os' has no attribute 'missing_attr_xyz'"
+
 
 class TestGetInstalledPackages:
     """Test suite for get_installed_packages."""
 
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Give each test a fresh cache so patched lookups are actually exercised."""
+        get_installed_packages.cache_clear()
+        yield
+        get_installed_packages.cache_clear()
+
     def test_returns_set(self):
         """Test that function returns a set."""
         result = get_installed_packages()
@@ -103,19 +135,69 @@ class TestGetInstalledPackages:
         for pkg in result:
             assert pkg == pkg.lower()
 
+    def test_includes_installed_distribution(self):
+        """Test that a distribution known to be installed is reported."""
+        result = get_installed_packages()
+
+        assert "pytest" in result
+
+    @patch("ast_import_analyzer.utils.distributions")
+    def test_skips_distributions_without_name(self, mock_distributions):
+        """Test that distributions with broken metadata are ignored."""
+        named, unnamed = MagicMock(), MagicMock()
+        named.metadata = {"Name": "Requests"}
+        unnamed.metadata = {}
+        mock_distributions.return_value = [named, unnamed]
+
+        result = get_installed_packages()
+
+        assert result == {"requests"}
+
+    @patch("ast_import_analyzer.utils.subprocess.run")
+    @patch("ast_import_analyzer.utils.distributions")
+    def test_falls_back_to_pip(self, mock_distributions, mock_run):
+        """Test that pip freeze output is used when metadata can't be read."""
+        mock_distributions.side_effect = OSError("unreadable site-packages")
+        mock_run.return_value.returncode = 0
+        mock_run.return_value.stdout = "Requests==2.31.0\nsix==1.16.0\n"
+
+        result = get_installed_packages()
+
+        assert result == {"requests", "six"}
+
     @patch("ast_import_analyzer.utils.subprocess.run")
-    def test_handles_pip_failure(self, mock_run):
-        """Test handling of pip failure."""
+    @patch("ast_import_analyzer.utils.distributions")
+    def test_handles_pip_failure(self, mock_distributions, mock_run):
+        """Test handling of pip failure after the metadata lookup fails."""
+        mock_distributions.side_effect = OSError("unreadable site-packages")
         mock_run.return_value.returncode = 1
 
         result = get_installed_packages()
 
         assert result == set()
 
+    def test_result_is_cached(self):
+        """Test that repeated calls reuse the first result."""
+        assert get_installed_packages() is get_installed_packages()
+
 
 class TestVirtualEnvChecker:
     """Test suite for VirtualEnvChecker."""
 
+    @pytest.fixture
+    def make_layout(self, tmp_path: Path):
+        """Build a directory from entry names; names ending in '/' become subdirectories."""
+
+        def make(entries: list[str]) -> Path:
+            for entry in entries:
+                if entry.endswith("/"):
+                    os.mkdir(tmp_path / entry)
+                else:
+                    (tmp_path / entry).touch()
+            return tmp_path
+
+        return make
+
     def test_non_directory(self, tmp_path: Path):
         """Test that non-directories return False."""
         file_path = tmp_path / "file.txt"
@@ -125,47 +207,52 @@ class TestVirtualEnvChecker:
 
         assert checker.is_venv(file_path) is False
 
-    def test_empty_directory(self, tmp_path: Path):
-        """Test that empty directory returns False."""
+    def test_missing_path(self, tmp_path: Path):
+        """Test that a path that doesn't exist returns False."""
         checker = VirtualEnvChecker()
 
-        assert checker.is_venv(tmp_path) is False
+        assert checker.is_venv(tmp_path / "missing") is False
+
+    def test_has_venv_layout(self):
+        """Test checking an existing directory listing for venv indicators."""
+        checker = VirtualEnvChecker()
 
-    def test_venv_with_pyvenv_cfg(self, tmp_path: Path):
-        """Test detection of venv with pyvenv.cfg."""
-        venv_dir = tmp_path / "venv"
-        venv_dir.mkdir()
-        (venv_dir / "pyvenv.cfg").write_text("home = /usr/bin")
-        (venv_dir / "bin").mkdir()
-        (venv_dir / "include").mkdir()
-        (venv_dir / "lib").mkdir()
+        assert checker.has_venv_layout({"bin", "include", "lib", "pyvenv.cfg", "share"}) is True
+        assert checker.has_venv_layout({"bin", "lib", "src"}) is False
 
+    def test_empty_directory(self, tmp_path: Path):
+        """Test that empty directory returns False."""
         checker = VirtualEnvChecker()
 
-        assert checker.is_venv(venv_dir) is True
+        assert checker.is_venv(tmp_path) is False
 
-    def test_partial_venv_structure(self, tmp_path: Path):
-        """Test that partial venv structure returns False."""
-        venv_dir = tmp_path / "partial_venv"
-        venv_dir.mkdir()
-        (venv_dir / "bin").mkdir()
-        # Missing other indicators
+    @pytest.mark.parametrize(
+        ("entries", "expected"),
+        [
+            (["bin/", "include/", "lib/", "pyvenv.cfg"], True),
+            (["bin/", "include/", "lib/", "share/", "pyvenv.cfg"], True),
+            (["bin/"], False),
+            (["bin/", "include/", "lib/"], False),
+            (["src/", "tests/", "README.md"], False),
+        ],
+        ids=["venv", "venv_extra_dirs", "partial", "missing_pyvenv_cfg", "project"],
+    )
+    def test_directory_layouts(self, make_layout, entries: list[str], expected: bool):
+        """Test venv detection across directory layouts."""
+        directory = make_layout(entries)
 
         checker = VirtualEnvChecker()
 
-        assert checker.is_venv(venv_dir) is False
+        assert checker.is_venv(directory) is expected
 
-    def test_regular_project_directory(self, tmp_path: Path):
-        """Test that regular project directory returns False."""
-        project = tmp_path / "project"
-        project.mkdir()
-        (project / "src").mkdir()
-        (project / "tests").mkdir()
-        (project / "README.md").write_text("# Project")
+    def test_unknown_platform_requires_pyvenv_cfg(self, tmp_path: Path, monkeypatch):
+        """Test that other platforms only look for pyvenv.cfg."""
+        monkeypatch.setattr("ast_import_analyzer.utils.sys.platform", "plan9")
+        (tmp_path / "pyvenv.cfg").write_text("home = /usr/bin")
 
         checker = VirtualEnvChecker()
 
-        assert checker.is_venv(project) is False
+        assert checker.is_venv(tmp_path) is True
 
     def test_venv_indicators_defined(self):
         """Test that venv indicators are defined for common platforms."""
@@ -1,218 +1,312 @@
 """Tests for the ImportsVisitor class."""
 
 import ast
+from bisect import bisect_right
 
 import pytest
 
-from ast_import_analyzer.visitor import ImportsVisitor
+from ast_import_analyzer.visitor import ImportsVisitor, extract_imports_and_defs
+
+SNIPPETS = {
+    "simple_import": "import os",
+    "multiple_imports": "import os, sys, json",
+    "from_import": "from os import path",
+    "from_import_multiple": "from os import path, getcwd, listdir",
+    "nested_from_import": "from os.path import join, dirname",
+    "relative_import_with_module": "from .utils import helper",
+    "relative_import_no_module": "from . import config",
+    "star_import": "from os import *",
+    "imported_module_parts": "import os.path\nfrom collections.abc import Iterator\nfrom . import config",
+    "function_definition": """
+def my_function():
+    pass
+""",
+    "async_function_definition": """
+async def my_async_function():
+    pass
+""",
+    "class_definition": """
+class MyClass:
+    pass
+""",
+    "variable_assignment": "MY_CONSTANT = 42",
+    "tuple_unpacking": "a, b, c = 1, 2, 3",
+    "starred_unpacking": "first, *rest = items",
+    "nested_unpacking": "(x, y), [z] = pairs",
+    "nested_class_detection": """
+class Outer:
+    class Inner:
+        pass
+""",
+    "nested_function_in_class": """
+class MyClass:
+    def my_method(self):
+        pass
+""",
+    "function_bodies_skipped_by_default": """
+def loader():
+    import json
+    cache = {}
+""",
+    "function_bodies_visited_when_requested": """
+async def loader():
+    import json
+    cache = {}
+""",
+    "complex_file": """
+import os
+import sys
+from pathlib import Path
+from typing import Optional, List
+
+MY_VAR = "test"
+
+class Config:
+    DEBUG = True
+
+def get_config():
+    return Config()
+
+async def async_loader():
+    pass
+""",
+    "nested_blocks": """
+try:
+    import ujson as json
+except ImportError:
+    import json
+else:
+    FAST = True
+finally:
+    DONE = True
+
+if json:
+    with open(__file__) as fh:
+        for line in fh:
+            LAST = line
+""",
+    "empty_file": "",
+    "config_module": """
+from os import path
+
+class Config:
+    DEBUG = True
+""",
+}
+
+
+def _parse_snippets(snippets: dict[str, str]) -> dict[str, ast.Module]:
+    """Parse all snippets with a single ast.parse call and split the tree by line range."""
+    names: list[str] = []
+    first_lines: list[int] = []
+    lines: list[str] = []
+    for name, code in snippets.items():
+        names.append(name)
+        first_lines.append(len(lines) + 1)
+        lines.extend(code.split("\n"))
+
+    trees = {name: ast.Module(body=[], type_ignores=[]) for name in names}
+    for stmt in ast.parse("\n".join(lines)).body:
+        owner = names[bisect_right(first_lines, stmt.lineno) - 1]
+        trees[owner].body.append(stmt)
+    return trees
+
+
+# Visitors never mutate the tree, so every test can share these
+TREES = _parse_snippets(SNIPPETS)
+
+
+# (snippet, imports collected, definitions collected)
+VISITOR_CASES = [
+    ("simple_import", {"os"}, set()),
+    ("multiple_imports", {"os", "sys", "json"}, set()),
+    ("from_import", {"os.path"}, set()),
+    ("from_import_multiple", {"os.path", "os.getcwd", "os.listdir"}, set()),
+    ("nested_from_import", {"os.path.join", "os.path.dirname"}, set()),
+    ("relative_import_with_module", {"utils.helper"}, set()),
+    ("relative_import_no_module", {"config"}, set()),
+    ("star_import", {"os"}, set()),
+    ("function_definition", set(), {"my_function"}),
+    ("async_function_definition", set(), {"my_async_function"}),
+    ("class_definition", set(), {"MyClass"}),
+    ("variable_assignment", set(), {"MY_CONSTANT"}),
+    ("tuple_unpacking", set(), {"a", "b", "c"}),
+    ("starred_unpacking", set(), {"first", "rest"}),
+    ("nested_unpacking", set(), {"x", "y", "z"}),
+    ("nested_class_detection", set(), {"Outer", "Inner"}),
+    ("nested_function_in_class", set(), {"MyClass", "my_method"}),
+    ("nested_blocks", {"ujson", "json"}, {"FAST", "DONE", "LAST"}),
+]
 
 
 class TestImportsVisitor:
     """Test suite for ImportsVisitor."""
 
-    def test_simple_import(self):
-        """Test detection of simple import statements."""
-        code = "import os"
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
+    @pytest.mark.parametrize(
+        ("snippet", "expected_imports", "expected_defs"),
+        VISITOR_CASES,
+        ids=[case[0] for case in VISITOR_CASES],
+    )
+    def test_collects(self, visitor, snippet, expected_imports, expected_defs):
+        """Test that each snippet's imports and definitions are collected."""
+        visitor.visit(TREES[snippet])
+
+        assert visitor.imported_modules == expected_imports
+        assert visitor.module_defs == expected_defs
+
+    def test_imported_module_parts(self, visitor):
+        """Test that each imported path is recorded with its components."""
+        tree = TREES["imported_module_parts"]
         visitor.visit(tree)
 
-        assert "os" in visitor.imported_modules
+        assert visitor.imported_module_parts == {
+            "os.path": ("os", "path"),
+            "collections.abc.Iterator": ("collections", "abc", "Iterator"),
+            "config": ("config",),
+        }
 
-    def test_multiple_imports(self):
-        """Test detection of multiple imports on one line."""
-        code = "import os, sys, json"
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
+    def test_visits_accumulate(self, visitor):
+        """Test that visiting several trees merges their imports and definitions."""
+        visitor.visit(TREES["simple_import"])
+        visitor.visit(TREES["from_import"])
+        visitor.visit(TREES["variable_assignment"])
 
-        assert "os" in visitor.imported_modules
-        assert "sys" in visitor.imported_modules
-        assert "json" in visitor.imported_modules
+        assert visitor.imported_modules == {"os", "os.path"}
+        assert visitor.imported_modules == set(visitor.imported_module_parts)
+        assert visitor.module_defs == {"MY_CONSTANT"}
 
-    def test_from_import(self):
-        """Test detection of from...import statements."""
-        code = "from os import path"
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
+    def test_generic_visit_keeps_imports_in_sync(self):
+        """Test that imports found through generic_visit are collected as they are added."""
 
-        assert "os.path" in visitor.imported_modules
+        class ClassBodyVisitor(ImportsVisitor):
+            def visit_ClassDef(self, node):
+                self.generic_visit(node)
 
-    def test_from_import_multiple(self):
-        """Test detection of multiple names in from...import."""
-        code = "from os import path, getcwd, listdir"
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
+        visitor = ClassBodyVisitor()
+        visitor.visit(ast.parse("class Lazy:\n    import os\n    from json import loads\n"))
 
-        assert "os.path" in visitor.imported_modules
-        assert "os.getcwd" in visitor.imported_modules
-        assert "os.listdir" in visitor.imported_modules
+        assert visitor.imported_modules == {"os", "json.loads"}
+        assert visitor.imported_modules == set(visitor.imported_module_parts)
 
-    def test_nested_from_import(self):
-        """Test detection of nested module imports."""
-        code = "from os.path import join, dirname"
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
+    def test_expression_hook_rejected(self):
+        """Test that overriding a hook the statement walk never reaches raises."""
+        with pytest.raises(TypeError, match="visit_Name"):
 
-        assert "os.path.join" in visitor.imported_modules
-        assert "os.path.dirname" in visitor.imported_modules
+            class NameVisitor(ImportsVisitor):
+                def visit_Name(self, node):
+                    pass
 
-    def test_relative_import_with_module(self):
-        """Test detection of relative imports with module name."""
-        code = "from .utils import helper"
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
+    def test_generic_visit_override_rejected(self):
+        """Test that overriding generic_visit, which the walk never calls, raises."""
+        with pytest.raises(TypeError, match="generic_visit"):
 
-        assert "utils.helper" in visitor.imported_modules
+            class CustomVisitor(ImportsVisitor):
+                def generic_visit(self, node):
+                    pass
 
-    def test_relative_import_no_module(self):
-        """Test detection of relative imports without module name."""
-        code = "from . import config"
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
+    def test_reset(self):
+        """Test that reset clears collected state but keeps the configuration."""
+        visitor = ImportsVisitor(module_level_only=False)
+        visitor.visit(TREES["complex_file"])
 
-        assert "config" in visitor.imported_modules
+        visitor.reset()
 
-    def test_star_import(self):
-        """Test detection of star imports."""
-        code = "from os import *"
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
+        assert visitor.imported_modules == set()
+        assert visitor.imported_module_parts == {}
+        assert visitor.module_defs == set()
+        assert visitor.module_level_only is False
 
-        assert "os" in visitor.imported_modules
-
-    def test_function_definition(self):
-        """Test detection of function definitions."""
-        code = """
-def my_function():
-    pass
-"""
-        tree = ast.parse(code)
+    def test_instances_have_no_dict(self):
+        """Test that __slots__ takes effect, so instances carry no __dict__."""
         visitor = ImportsVisitor()
-        visitor.visit(tree)
 
-        assert "my_function" in visitor.module_defs
+        assert not hasattr(visitor, "__dict__")
+        with pytest.raises(AttributeError):
+            visitor.unexpected = True
 
-    def test_async_function_definition(self):
-        """Test detection of async function definitions."""
-        code = """
-async def my_async_function():
-    pass
-"""
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
+    def test_node_visitor_hooks(self, visitor):
+        """Test that the ast.NodeVisitor-style hooks can be called directly."""
+        module = TREES["complex_file"]
+        for node in module.body:
+            getattr(visitor, f"visit_{type(node).__name__}", visitor.generic_visit)(node)
 
-        assert "my_async_function" in visitor.module_defs
+        assert visitor.imported_modules >= {"os", "pathlib.Path"}
+        assert visitor.module_defs >= {"MY_VAR", "Config", "get_config"}
 
-    def test_class_definition(self):
-        """Test detection of class definitions."""
-        code = """
-class MyClass:
-    pass
-"""
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
+    def test_visit_import_hook_called_directly(self, visitor):
+        """Test that calling visit_Import alone records the import."""
+        visitor.visit_Import(ast.parse("import os.path").body[0])
 
-        assert "MyClass" in visitor.module_defs
+        assert visitor.imported_modules == {"os.path"}
+        assert visitor.imported_module_parts == {"os.path": ("os", "path")}
 
-    def test_variable_assignment(self):
-        """Test detection of variable assignments."""
-        code = "MY_CONSTANT = 42"
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
+    def test_subclass_hooks_are_used(self):
+        """Test that a subclass overriding a visit_* hook is called by the walk."""
 
-        assert "MY_CONSTANT" in visitor.module_defs
+        class NoStdlibVisitor(ImportsVisitor):
+            def visit_Import(self, node):
+                node.names = [alias for alias in node.names if alias.name != "os"]
+                super().visit_Import(node)
 
-    def test_tuple_unpacking(self):
-        """Test detection of tuple unpacking assignments."""
-        code = "a, b, c = 1, 2, 3"
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
+            def visit_If(self, node):
+                self.module_defs.add("<if>")
+                self.generic_visit(node)
 
-        assert "a" in visitor.module_defs
-        assert "b" in visitor.module_defs
-        assert "c" in visitor.module_defs
+        visitor = NoStdlibVisitor()
+        visitor.visit(ast.parse("import os, json\nif True:\n    import sys\n"))
 
-    def test_nested_class_detection(self):
-        """Test that nested classes are detected via generic_visit."""
-        code = """
-class Outer:
-    class Inner:
-        pass
-"""
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
+        assert visitor.imported_modules == {"json", "sys"}
+        assert visitor.module_defs == {"<if>"}
+
+    def test_function_bodies_skipped_by_default(self, visitor):
+        """Test that imports and locals inside functions are not collected."""
+        tree = TREES["function_bodies_skipped_by_default"]
         visitor.visit(tree)
 
-        assert "Outer" in visitor.module_defs
-        assert "Inner" in visitor.module_defs
+        assert visitor.module_defs & {"loader", "cache"} == {"loader"}
+        assert visitor.imported_modules & {"json"} == set()
 
-    def test_nested_function_in_class(self):
-        """Test that methods in classes are detected."""
-        code = """
-class MyClass:
-    def my_method(self):
-        pass
-"""
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
+    def test_function_bodies_visited_when_requested(self):
+        """Test that module_level_only=False descends into function bodies."""
+        tree = TREES["function_bodies_visited_when_requested"]
+        visitor = ImportsVisitor(module_level_only=False)
         visitor.visit(tree)
 
-        assert "MyClass" in visitor.module_defs
-        assert "my_method" in visitor.module_defs
+        assert visitor.module_defs >= {"loader", "cache"}
+        assert visitor.imported_modules >= {"json"}
 
-    def test_complex_file(self):
+    def test_complex_file(self, visitor):
         """Test a complex file with multiple imports and definitions."""
-        code = """
-import os
-import sys
-from pathlib import Path
-from typing import Optional, List
+        tree = TREES["complex_file"]
+        visitor.visit(tree)
 
-MY_VAR = "test"
+        assert visitor.imported_modules >= {
+            "os",
+            "sys",
+            "pathlib.Path",
+            "typing.Optional",
+            "typing.List",
+        }
+        assert visitor.module_defs >= {"MY_VAR", "Config", "get_config", "async_loader"}
 
-class Config:
-    DEBUG = True
+    def test_empty_file(self, visitor):
+        """Test parsing an empty file."""
+        tree = TREES["empty_file"]
+        visitor.visit(tree)
 
-def get_config():
-    return Config()
+        assert visitor.imported_modules == set()
+        assert visitor.module_defs == set()
 
-async def async_loader():
-    pass
-"""
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
 
-        # Check imports
-        assert "os" in visitor.imported_modules
-        assert "sys" in visitor.imported_modules
-        assert "pathlib.Path" in visitor.imported_modules
-        assert "typing.Optional" in visitor.imported_modules
-        assert "typing.List" in visitor.imported_modules
+class TestExtractImportsAndDefs:
+    """Test suite for extract_imports_and_defs."""
 
-        # Check definitions
-        assert "MY_VAR" in visitor.module_defs
-        assert "Config" in visitor.module_defs
-        assert "get_config" in visitor.module_defs
-        assert "async_loader" in visitor.module_defs
+    def test_returns_imports_parts_and_defs(self):
+        """Test that all three collections are returned from one pass."""
+        tree = TREES["config_module"]
 
-    def test_empty_file(self):
-        """Test parsing an empty file."""
-        code = ""
-        tree = ast.parse(code)
-        visitor = ImportsVisitor()
-        visitor.visit(tree)
+        imported_modules, imported_module_parts, module_defs = extract_imports_and_defs(tree)
 
-        assert len(visitor.imported_modules) == 0
-        assert len(visitor.module_defs) == 0
+        assert imported_modules == {"os.path"}
+        assert imported_module_parts == {"os.path": ("os", "path")}
+        assert module_defs == {"Config", "DEBUG"}